@@ -20,6 +20,7 @@ def parse_arguments(default_settings: str) -> Dict[str, Any]:
     parser.add_argument("-w", "--write", action="store_true", help="Write timestamps")
     parser.add_argument("-r", "--read", action="store_true", help="Read timestamps")
     parser.add_argument("-s", "--settings", type=str, help="Settings file (e.g., projects.yaml)")
+    parser.add_argument("-f", "--force", action="store_true", help="Force rescan (ignore existing timestamps)")
 
     args: Namespace = parser.parse_args()
 
@@ -39,5 +40,6 @@ def parse_arguments(default_settings: str) -> Dict[str, Any]:
 
     return {
         "write":   write,
+        "force":   args.force,
         "setting": setting,
     }
@@ -9,9 +9,13 @@
 
     PRIVAT:
      - match_not_exclude( name: str, excludes: None | Dict[str, str] ) -> bool
+     - compile_excludes( excludes: None | List[str] ) -> None | re.Pattern[str]
 """
+import os
+import re
 import fnmatch
 
+from collections import deque
 from typing import Any, Dict, List, Tuple
 from pathlib import Path
 
@@ -33,6 +37,15 @@ def match_not_exclude( name: str, excludes: None | Dict[str, str] ) -> bool:
 
     return True
 
+# all patterns in one regex (compiled once per walk, not per entry)
+
+def compile_excludes( excludes: None | List[str] ) -> None | re.Pattern[str]:
+    if not excludes:
+        return None
+
+    flags = re.IGNORECASE if os.name == "nt" else 0 # like fnmatch.fnmatch (os.path.normcase)
+    return re.compile( "|".join(fnmatch.translate(exclude) for exclude in excludes), flags )
+
 @duration("{__name__} '{0}'")
 def get_filepaths_all(
     path: Path,
@@ -86,32 +99,45 @@ def get_filepaths_ancor(
     folders: List[str] = []
     errors:  List[str] = []
 
-    def get_filepaths( rel_path: str ) -> None:
-        curr_path = ancor_path / rel_path
-        try:
-            for entry in Path(curr_path).iterdir():
-                if rel_path == "":
-                    name = entry.name
-                else:
-                    name = rel_path + "/" + entry.name # as posix
+    # iterative (no recursion limit), os.scandir: is_file/is_dir use the cached dirent
+    # plain strings while walking (no Path objects per folder)
 
-                if entry.is_file():
-                    if match_not_exclude(entry.name, exclude["files"]):
-                        files.append( name )
-                elif entry.is_dir():
-                    if match_not_exclude(entry.name, exclude["folder"]):
-                        folders.append( name )
-                        get_filepaths( name )
+    ancor_str = os.fspath(ancor_path)
+
+    folder_re = compile_excludes(exclude["folder"])
+    files_re  = compile_excludes(exclude["files"])
+
+    stack: deque[str] = deque([""])
+    while stack:
+        rel_path = stack.pop()
+        curr_path = ancor_str if rel_path == "" else ancor_str + "/" + rel_path
+
+        sub_folders: List[str] = []
+        try:
+            with os.scandir(curr_path) as it:
+                for entry in it:
+                    if rel_path == "":
+                        name = entry.name
+                    else:
+                        name = rel_path + "/" + entry.name # as posix
+
+                    if entry.is_file():
+                        if files_re is None or not files_re.match(entry.name):
+                            files.append( name )
+                    elif entry.is_dir():
+                        if folder_re is None or not folder_re.match(entry.name):
+                            folders.append( name )
+                            sub_folders.append( name )
 
         except PermissionError as err:
-            errors.append( Path(curr_path).as_posix() )
+            errors.append( curr_path.replace("\\", "/") )
             Trace.error( f"{err}" )
 
         except NotADirectoryError as err: # symlink
-            errors.append( Path(curr_path).as_posix() )
+            errors.append( curr_path.replace("\\", "/") )
             Trace.error( f"{err}" )
 
-    get_filepaths("")
+        stack.extend( reversed(sub_folders) ) # keep depth-first order
 
     if len(errors)>0:
         Trace.error(f"errors: {errors}")
@@ -4,45 +4,120 @@
     helper/timestamps.py
 
     PUBLIC:
-     - read_metadata(drive_path: Path, project_path: Path, ignore_list: Dict[str, List[str]], reset: bool=False) -> None
+     - read_metadata(drive_path: Path, project_path: Path, ignore_list: Dict[str, List[str]], reset: bool=False, max_workers: int | None = None) -> None
      - write_metadata(drive_path: Path, project_path: Path, verbose: bool=False) -> bool:
+     - get_max_workers() -> int
 
     TO LIB:
      - format_time( time: float ) -> str
      - scan_time( timestamp: str ) -> float
+     - scan_time_ns( timestamp: str ) -> int
      - get_file_arributes( path: Path ) -> str
-     - calculate_md5(file_path: Path) -> str
+     - calculate_hash(file_path: Path | str, hash_algo: str = HASH_ALGO) -> str
+     - calculate_hashes(file_path: Path | str, hash_algos: Tuple[str, ...]) -> Tuple[str, ...]
+     - hash_available( hash_algo: str ) -> bool
 
     PRIVATE:
-     - scan_files(drive: Path, project_path: Path, files: List[str]) -> Dict[str, Any]
-     - get_file_metadata(file_path: Path, project_path: Path) -> Tuple[str, Dict[str, str | int] | None]
-     - update_metadata(existing_metadata: Dict[str, Any], new_metadata: Dict[str, Any]) -> Dict[str, Any]
+     - scan_files(drive: Path, project_path: Path, files: List[str], existing_metadata: Dict[str, Any], hash_algo: str = HASH_ALGO, max_workers: int | None = None) -> Dict[str, Any]
+     - migrate_metadata(drive: Path, project_path: Path, existing_metadata: Dict[str, Any], hash_algo: str, max_workers: int | None = None) -> Dict[str, Any] | None
+     - get_file_metadata(file_path: Path | str, key: str, cache: Dict[str, Any] | None = None, hash_algo: str = HASH_ALGO) -> Tuple[str, Dict[str, str | int] | None]
+     - get_stored_metadata( data: Dict[str, Any] ) -> Tuple[str, Dict[str, Any]]
+     - _attrs_from_stat( st: os.stat_result ) -> str
+     - _format_offset( gmtoff: int ) -> str
+     - _parse_time( timestamp: str ) -> datetime
+     - _get_timezone( offset: timedelta ) -> timezone
+     - _new_hashlib( hash_algo: str ) -> Any
 """
 
 import os
+import math
+import mmap
 import hashlib
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Tuple
-from pathlib import Path, PurePosixPath
-from datetime import datetime, timezone
+from pathlib import Path
+from functools import cache
+from time import localtime
+from datetime import datetime, timedelta, timezone
 
 from utils.trace import Trace
-from utils.file  import check_path_exists, export_json, import_json
+from utils.file  import export_json, import_json
 
 from helper.rekursion import get_filepaths_ancor
 
+# blake2b (256 bit) from hashlib - always available, same result on every machine
+# older .timestamps.json (md5) are migrated on the next read
+
+HASH_ALGO = "blake2b-256"
+
+HASH_ALGO_LEGACY = "md5" # .timestamps.json without "hash_algo"
+MMAP_MIN_SIZE    = 1 << 20
+MAX_WORKERS      = 128
+
 TIMESTAMP_STORAGE = ".timestamps.json"
+TIME_FORMAT       = "%Y-%m-%d %H:%M:%S.%f%z"
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+_ATTR_TABLE = (
+    (0x00000001, "R"), # Read-only
+    (0x00000002, "H"), # Hidden
+    (0x00000004, "S"), # System
+    (0x00000010, "D"), # Directory
+    (0x00000020, "A"), # Archive
+    (0x00001000, "O"), # Offline
+    (0x00002000, "I"), # Indexable
+    (0x00080000, "P"), # Pinned
+)
+
+# all combinations of the low byte (R, H, S, D, A) precomputed, the rest (O, I, P) checked one by one
+
+_ATTR_LOW  = tuple( "".join(char for mask, char in _ATTR_TABLE if mask < 0x100 and i & mask) for i in range(0x100) )
+_ATTR_HIGH = tuple( (mask, char) for mask, char in _ATTR_TABLE if mask >= 0x100 )
 
 # PUBLIC:
-def read_metadata(drive_path: Path, project_path: Path, ignore_list: Dict[str, List[str]], reset: bool=False) -> bool:
+def read_metadata(drive_path: Path, project_path: Path, ignore_list: Dict[str, List[str]], reset: bool=False, max_workers: int | None = None) -> bool:
 
-    files, _folders, _errors = get_filepaths_ancor( drive_path / project_path, exclude = ignore_list, show_result=False )
-    metadata = scan_files(drive_path, project_path, files)
+    # other hash algorithm (md5 for old files) => migrate to HASH_ALGO, verified entries keep their timestamps
+    # (a failed hash => keep the old algorithm for this run, the migration is retried on the next one)
 
+    hash_algo = HASH_ALGO
+    old_data: Dict[str, Any] | None = None
+    existing_metadata: Dict[str, Any] = {}
     if not reset:
         old_data = import_json( project_path, TIMESTAMP_STORAGE, show_error=False )
         if old_data is not None:
-            metadata = update_metadata( old_data["metadata"], metadata )
+            old_hash_algo, old_metadata = get_stored_metadata( old_data )
+            if old_hash_algo == HASH_ALGO:
+                existing_metadata = old_metadata
+            elif hash_available(old_hash_algo):
+                migrated = migrate_metadata(drive_path, project_path, old_metadata, old_hash_algo, max_workers)
+                if migrated is not None:
+                    existing_metadata = migrated
+                    Trace.info( f"'{project_path}' hash '{old_hash_algo}' => '{hash_algo}'" )
+                else:
+                    hash_algo = old_hash_algo
+                    existing_metadata = old_metadata
+                    Trace.warning( f"'{project_path}' hash '{old_hash_algo}' kept - migration to '{HASH_ALGO}' incomplete" )
+            else:
+                Trace.warning( f"'{project_path}' hash '{old_hash_algo}' not available - rescan with '{hash_algo}'" )
+                old_data = None
+
+    files, _folders, _errors = get_filepaths_ancor( drive_path / project_path, exclude = ignore_list, show_result=False )
+    metadata = scan_files(drive_path, project_path, files, existing_metadata, hash_algo, max_workers)
+
+    # nothing changed => keep the file as is (unchanged entries are the identical objects from existing_metadata)
+
+    if (
+        old_data is not None
+        and old_data["scan"].get("hash_algo") == hash_algo
+        and old_data["scan"].get("ignore") == ignore_list
+        and metadata.keys() == existing_metadata.keys()
+        and all(data is existing_metadata[key] for key, data in metadata.items())
+    ):
+        Trace.result( f"'{project_path}' {len(files)} files - unchanged" )
+        return True
 
     filedata = {
         "scan": {
@@ -50,6 +125,7 @@ def read_metadata(drive_path: Path, project_path: Path, ignore_list: Dict[str, L
             "path": (drive_path / project_path).as_posix(),
             "files": len(files),
             "ignore": ignore_list,
+            "hash_algo": hash_algo,
         },
         "metadata": metadata
     }
@@ -63,154 +139,324 @@ def write_metadata(drive_path: Path, project_path: Path, verbose: bool=False) ->
     if data is None:
         return False
 
-    infos = data["metadata"]
+    hash_algo, infos = get_stored_metadata( data )
+    if not hash_available(hash_algo):
+        Trace.error( f"'{project_path}' hash '{hash_algo}' not available" )
+        return False
 
     count = 0
+    up_to_date = 0 # summary only - one trace per file is expensive for large repos
     for key, values in infos.items():
-        md5      = values["md5"]
-        modified = values["modified"]
-        epoche   = scan_time(modified)
-
         fullpath = drive_path / project_path / key
 
-        if os.path.exists(fullpath):
-            _, metadata = get_file_metadata(fullpath, key)
-            if metadata is None:
-                Trace.error(f"'{key}' error")
-                continue
-
-            if metadata["md5"] == md5:
-                if modified != metadata["modified"]:
-                    os.utime(fullpath, (-1, epoche))
-                    Trace.update(f"'{key}' update modification date")
-                    count += 1
-                else:
-                    if verbose:
-                        Trace.info(f"'{key}' unchanged [modification date is up-to-date]")
-            else:
-                if verbose:
-                    Trace.info(f"'{key}' unchanged [md5 hash is different]")
-        else:
+        try:
+            st = os.stat(fullpath)
+        except FileNotFoundError:
             if verbose:
                 Trace.info(f"'{key}' not found in project")
+            continue
+
+        # same modification date => nothing to do (no hash needed)
+        # compare in ns, the formatted string depends on the local utc offset
+
+        modified_ns = values["modified_ns"]
+        if st.st_mtime_ns == modified_ns:
+            up_to_date += 1
+            continue
+
+        # hash decides whether the stored date belongs to this content
 
-    Trace.result( f"'{project_path}' {count} timestamp(s) updated" )
+        file_hash = calculate_hash(fullpath, hash_algo)
+        if file_hash == "" or file_hash != values["hash"]:
+            if verbose:
+                Trace.info(f"'{key}' unchanged [hash is different]")
+            continue
+
+        os.utime(fullpath, ns=(st.st_atime_ns, modified_ns)) # keep access time
+        Trace.update(f"'{key}' update modification date")
+        count += 1
+
+    Trace.result( f"'{project_path}' {count} timestamp(s) updated, {up_to_date} up-to-date" )
     return True
 
 # TO LIB
 def format_time( time: float) -> str:
-    datetime_object = datetime.fromtimestamp(time, tz=timezone.utc).astimezone(tz=None)
-    return datetime_object.strftime("%Y-%m-%d %H:%M:%S.%f%z")
+
+    # same result as datetime.fromtimestamp(time).astimezone().strftime(TIME_FORMAT) - without datetime + strftime
+    # µs rounding as in datetime (round half even), utc offset per timestamp (DST)
+
+    frac, seconds = math.modf(time)
+    us = round(frac * 1_000_000)
+    if us >= 1_000_000:
+        seconds += 1
+        us -= 1_000_000
+    elif us < 0:
+        seconds -= 1
+        us += 1_000_000
+
+    lt = localtime(seconds)
+    return f"{lt.tm_year:04d}-{lt.tm_mon:02d}-{lt.tm_mday:02d} {lt.tm_hour:02d}:{lt.tm_min:02d}:{lt.tm_sec:02d}.{us:06d}{_format_offset(lt.tm_gmtoff)}"
 
 def scan_time( timestamp: str ) -> float:
-    datetime_object = datetime.strptime(timestamp, "%Y-%m-%d %H:%M:%S.%f%z")
-    return datetime_object.timestamp()
+    return _parse_time(timestamp).timestamp()
+
+def scan_time_ns( timestamp: str ) -> int:
+    return (_parse_time(timestamp) - _EPOCH) // timedelta(microseconds=1) * 1000 # exact, no float rounding
+
+def _parse_time( timestamp: str ) -> datetime:
+
+    # fixed width "2025-02-03 12:34:56.123456+0100" => slicing instead of strptime (regex per call)
+
+    if len(timestamp) == 31 and timestamp[26] in "+-":
+        try:
+            offset = timedelta(hours=int(timestamp[27:29]), minutes=int(timestamp[29:31]))
+            if timestamp[26] == "-":
+                offset = -offset
+
+            return datetime(
+                int(timestamp[0:4]), int(timestamp[5:7]), int(timestamp[8:10]),
+                int(timestamp[11:13]), int(timestamp[14:16]), int(timestamp[17:19]), int(timestamp[20:26]),
+                tzinfo=_get_timezone(offset)
+            )
+        except ValueError:
+            pass
+
+    return datetime.strptime(timestamp, TIME_FORMAT)
+
+@cache
+def _format_offset( gmtoff: int ) -> str:
+    sign = "-" if gmtoff < 0 else "+"
+    minutes, secs = divmod(abs(gmtoff), 60)
+    hours, minutes = divmod(minutes, 60)
+
+    if secs:
+        return f"{sign}{hours:02d}{minutes:02d}{secs:02d}"
+    return f"{sign}{hours:02d}{minutes:02d}"
+
+@cache
+def _get_timezone( offset: timedelta ) -> timezone:
+    return timezone(offset)
 
 """
     https://learn.microsoft.com/en-gb/windows/win32/fileio/file-attribute-constants?redirectedfrom=MSDN
 """
 def get_file_arributes( path: Path ) -> str:
-    attributes = os.stat(path).st_file_attributes
-
-    ret = ""
-    if attributes & 0x00000001: # Read-only
-        ret += "R"
-    if attributes & 0x00000002: # Hidden
-        ret += "H"
-    if attributes & 0x00000004: # System
-        ret += "S"
-    if attributes & 0x00000010: # Directory
-        ret += "D"
-    if attributes & 0x00000020: # Archive
-        ret += "A"
-    if attributes & 0x00001000: # Offline
-        ret += "O"
-    if attributes & 0x00002000: # Indexable
-        ret += "I"
-    if attributes & 0x00080000: # Pinned
-        ret += "P"
+    return _attrs_from_stat(os.stat(path))
+
+def _attrs_from_stat( st: os.stat_result ) -> str:
+    attributes = getattr(st, "st_file_attributes", 0) # Windows only
+
+    ret = _ATTR_LOW[attributes & 0xFF]
+    for mask, char in _ATTR_HIGH:
+        if attributes & mask:
+            ret += char
 
     return ret
 
-def calculate_md5(file_path: Path) -> str:
-    hash_md5 = hashlib.md5()
+def calculate_hash(file_path: Path | str, hash_algo: str = HASH_ALGO) -> str:
+    return calculate_hashes(file_path, (hash_algo,))[0]
+
+def calculate_hashes(file_path: Path | str, hash_algos: Tuple[str, ...]) -> Tuple[str, ...]:
+
+    # several algorithms (migration) => one read of the file for all hashes
+
     try:
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-    except OSError as err:
-        Trace.error( f"{err}" )
-        return ""
+        with open(file_path, "rb", buffering=0) as f:
+            if os.fstat(f.fileno()).st_size >= MMAP_MIN_SIZE: # never mmap empty files
+                hashers = [_new_hashlib(hash_algo) for hash_algo in hash_algos]
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm: # hash from page cache, no read() copies
+                    if hasattr(mmap, "MADV_SEQUENTIAL"):
+                        mm.madvise(mmap.MADV_SEQUENTIAL)
+                    for hasher in hashers:
+                        hasher.update(mm)
+
+            elif len(hash_algos) == 1:
+                hashers = [hashlib.file_digest(f, lambda: _new_hashlib(hash_algos[0]))] # read/update loop in C (3.11 or newer)
+
+            else:
+                hashers = [_new_hashlib(hash_algo) for hash_algo in hash_algos]
+                data = f.read()
+                for hasher in hashers:
+                    hasher.update(data)
+
+            return tuple(str(hasher.hexdigest()) for hasher in hashers)
+    except (OSError, ValueError) as err: # ValueError: mmap of a file truncated to 0 bytes after fstat
+        Trace.error( f"{err} - {file_path}" )
+        return ("",) * len(hash_algos)
+
+def _new_hashlib( hash_algo: str ) -> Any:
+
+    # change detection only => no FIPS / security checks
+
+    if hash_algo == "blake2b-256":
+        return hashlib.blake2b(digest_size=32, usedforsecurity=False)
+
+    return hashlib.new(hash_algo, usedforsecurity=False)
 
-    return hash_md5.hexdigest()
+def hash_available( hash_algo: str ) -> bool:
+    if hash_algo == "blake2b-256":
+        return True
+
+    return hash_algo in hashlib.algorithms_available
 
 # PRIVATE:
-def scan_files(drive: Path, project_path: Path, files: List[str]) -> Dict[str, Any]:
-    metadata: Dict[str, Any] = {}
-    for file in files:
-        file_path = drive / project_path / file
+def scan_files(drive: Path, project_path: Path, files: List[str], existing_metadata: Dict[str, Any], hash_algo: str = HASH_ALGO, max_workers: int | None = None) -> Dict[str, Any]:
+
+    # walking stays single-threaded, only hash + stat run in the pool (hashlib releases the GIL)
 
-        key = ""
+    base_path = os.fspath(drive / project_path)
+
+    def scan_file( file: str ) -> Tuple[str, Dict[str, str | int] | None]:
         try:
-            key, data = get_file_metadata(Path(file_path), project_path)
+            key, data = get_file_metadata(base_path + "/" + file, file, existing_metadata, hash_algo)
+        except OSError as err:
+            Trace.error( f"{err} - {file}" )
+            return (file, None)
+
+        # same content => keep the existing entry (incl. the original timestamps)
+
+        existing = existing_metadata.get(key)
+
+        # hash failed (e.g. file locked) => keep the existing entry, retried on the next run
+
+        if data is not None and existing is not None and data["hash"] == "":
+            return (key, existing)
+
+        if data is not None and existing is not None and existing["hash"] == data["hash"]:
+
+            # legacy entries: modified_ns from the µs string => take the exact ns once (else the cache never hits)
+
+            if existing["modified_ns"] != data["modified_ns"] and abs(existing["modified_ns"] - data["modified_ns"]) < 1000:
+                return (key, existing | {"modified_ns": data["modified_ns"]})
+
+            return (key, existing)
+
+        return (key, data)
+
+    metadata: Dict[str, Any] = {}
+    with ThreadPoolExecutor(max_workers=max_workers or get_max_workers()) as executor:
+        for key, data in executor.map(scan_file, files):
             if data is not None:
                 metadata[key] = data
+
+    return metadata
+
+def migrate_metadata(drive: Path, project_path: Path, existing_metadata: Dict[str, Any], hash_algo: str, max_workers: int | None = None) -> Dict[str, Any] | None:
+
+    # existing_metadata with hash_algo (e.g. md5) => entries with HASH_ALGO
+    #  - same content (old hash matches) => entry incl. the original timestamps, new hash
+    #  - changed or missing file => dropped (scan_files adds changed files with the current timestamps)
+    #  - failed hash => None (migration not possible in this run)
+
+    base_path = os.fspath(drive / project_path)
+
+    def migrate_entry( item: Tuple[str, Dict[str, Any]] ) -> Tuple[str, Dict[str, Any] | None, bool]:
+        key, values = item
+        file_path = base_path + "/" + key
+
+        try:
+            st = os.stat(file_path)
+        except FileNotFoundError:
+            return (key, None, True)
         except OSError as err:
             Trace.error( f"{err} - {key}" )
-            continue
+            return (key, None, False)
+
+        new_hash, old_hash = calculate_hashes(file_path, (HASH_ALGO, hash_algo))
+        if new_hash == "":
+            return (key, None, False)
+
+        if old_hash != values["hash"]:
+            return (key, None, True)
+
+        entry = values | {"hash": new_hash}
+        if abs(values["modified_ns"] - st.st_mtime_ns) < 1000: # legacy µs value => exact ns (see scan_files)
+            entry["modified_ns"] = st.st_mtime_ns
+
+        return (key, entry, True)
+
+    metadata: Dict[str, Any] = {}
+    with ThreadPoolExecutor(max_workers=max_workers or get_max_workers()) as executor:
+        for key, entry, success in executor.map(migrate_entry, existing_metadata.items()):
+            if not success:
+                return None
+            if entry is not None:
+                metadata[key] = entry
 
     return metadata
 
-def get_file_metadata(file_path: Path, project_path: Path) -> Tuple[str, Dict[str, str | int] | None]:
+def get_max_workers() -> int:
 
-    # file_path:    "G:\Python\_empty\.gitignore"
-    # project_path: "\Python\_empty"
-    #
-    # rel_path:     ""
-    # name:         ".gitignore"
+    # each worker keeps one read in flight => workers = I/O queue depth
+    #  - TIMESTAMPS_WORKERS=1 for spinning disks (avoid seek thrash)
+    #  - TIMESTAMPS_WORKERS=64 for NVMe (cold cache)
 
-    # file_path:    "G:\Python\_empty\src\utils\util.py"
-    # project_path: "\Python\_empty"
-    #
-    # rel_path:     "/src/utils"
-    # name:         "util.py"
+    workers = min(32, (os.cpu_count() or 1) * 4)
 
-    p1 = str(PurePosixPath(file_path).parent)
-    p2 = str(PurePosixPath(project_path))
-    rel_path = p1.split(p2)[-1].lstrip("/")
+    env = os.getenv("TIMESTAMPS_WORKERS")
+    if env is not None:
+        try:
+            workers = max(1, min(MAX_WORKERS, int(env)))
+        except ValueError:
+            Trace.warning( f"TIMESTAMPS_WORKERS '{env}' is not a number" )
+
+    return workers
 
-    if rel_path == "":
-        key = file_path.name
-    else:
-        key = rel_path + "/" + file_path.name
+def get_file_metadata(file_path: Path | str, key: str, cache: Dict[str, Any] | None = None, hash_algo: str = HASH_ALGO) -> Tuple[str, Dict[str, str | int] | None]:
 
-    if not check_path_exists(file_path):
+    # file_path: "G:\Python\_empty/src/utils/util.py"
+    # key:       "src/utils/util.py" (posix, relative to the project - from get_filepaths_ancor)
+    #
+    # rel_path:  "src/utils"
+    # name:      "util.py"
+
+    rel_path, _, name = key.rpartition("/")
+
+    try:
+        st = os.stat(file_path) # one stat for all values
+    except FileNotFoundError:
         return (key, None)
 
+    # unchanged size + modification date => reuse the cached entry as is (no file read, no new dict)
+
+    size     = st.st_size
+    modified = format_time(st.st_mtime)
+
+    cached = None if cache is None else cache.get(key)
+    # hash "" => calculate_hash failed (e.g. file locked) => retry
+
+    if cached is not None and cached["hash"] != "" and cached["size"] == size and cached["modified_ns"] == st.st_mtime_ns:
+        return (key, cached)
+
+    file_hash = calculate_hash(file_path, hash_algo)
+
     return (
         key,
         {
-            "md5":  calculate_md5(file_path),
+            "hash": file_hash,
             "path": rel_path,
-            "name": file_path.name,
-            "size": os.stat(file_path).st_size,
-            "attr": get_file_arributes(file_path),
-            "modified": format_time(os.path.getmtime(file_path)),
-            "created": format_time(os.path.getctime(file_path)),
-            "access": format_time(max(0, os.path.getatime(file_path))),
+            "name": name,
+            "size": size,
+            "attr": _attrs_from_stat(st),
+            "modified": modified,
+            "modified_ns": st.st_mtime_ns,
+            "created": format_time(st.st_ctime),
+            "access": format_time(max(0, st.st_atime)),
         }
     )
 
-def update_metadata(existing_metadata: Dict[str, Any], new_metadata: Dict[str, Any]) -> Dict[str, Any]:
-    updated = {}
+def get_stored_metadata( data: Dict[str, Any] ) -> Tuple[str, Dict[str, Any]]:
 
-    for key, data in new_metadata.items():
-        if key in existing_metadata:
-            if existing_metadata[key]["md5"] == data["md5"]:
-                updated[key] = existing_metadata[key]
-            else:
-                updated[key] = data
-        else:
-            updated[key] = data
+    # old format: no "hash_algo", md5 stored as "md5" => "hash", no "modified_ns" => from "modified"
+    # (old files are always rewritten - "hash_algo" is missing)
+
+    hash_algo = data["scan"].get("hash_algo", HASH_ALGO_LEGACY)
+
+    metadata = data["metadata"]
+    for values in metadata.values():
+        if "md5" in values:
+            values["hash"] = values.pop("md5")
+        if "modified_ns" not in values:
+            values["modified_ns"] = scan_time_ns(values["modified"])
 
-    return updated
+    return hash_algo, metadata
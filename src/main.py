@@ -3,25 +3,33 @@
 
 # python src/main.py -r
 # python src/main.py -r -s repos.yaml
+# python src/main.py -r -f           (force: rehash all files)
 
 # python src/main.py -w -s repos_single.yaml
 
 
+import os
 import sys
+import multiprocessing
 
-from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from threading import Thread
+from typing    import Any, Dict, List
+from pathlib   import Path
 
 from utils.globals   import DRIVE
 from utils.trace     import Trace
 from utils.prefs     import Prefs
 
 from helper.argsparse  import parse_arguments
-from helper.timestamps import read_metadata, write_metadata
+from helper.timestamps import read_metadata, write_metadata, get_max_workers
 
-def main( write: bool = False ) -> None:
+def main( write: bool = False, force: bool = False ) -> None:
     repos  = Prefs.get("repos")
     ignore_list = Prefs.get("ignore_list")
 
+    projects: List[Path] = []
     for repo in repos:
         dest = DRIVE / repo["path"] / repo["name"]
 
@@ -29,10 +37,59 @@ def main( write: bool = False ) -> None:
             Trace.error(f"repo '{dest}' not found")
             continue
 
-        if write:
-            write_metadata(DRIVE, Path(repo["path"]) / repo["name"], verbose=True)
-        else:
-            read_metadata(DRIVE, Path(repo["path"]) / repo["name"], ignore_list, reset=True)
+        projects.append( Path(repo["path"]) / repo["name"] )
+
+    if len(projects) == 0:
+        return
+
+    # repos are independent => one process per repo, trace output of the workers via queue (one writer)
+    # TIMESTAMPS_WORKERS is the total budget (e.g. 1 => one repo after the other in this process, one hashing thread)
+
+    workers   = get_max_workers()
+    processes = max(1, min(len(projects), os.cpu_count() or 1, workers))
+    threads   = max(1, workers // processes)
+
+    scan = partial(scan_project, ignore_list=ignore_list, write=write, force=force, threads=threads)
+
+    if processes == 1:
+        for project in projects:
+            scan(project)
+        return
+
+    queue: Any = multiprocessing.Queue()
+    listener = Thread(target=print_trace, args=(queue,), daemon=True)
+    listener.start()
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=processes,
+            initializer=init_worker,
+            initargs=(Trace.settings, queue),
+        ) as executor:
+            list( executor.map(scan, projects) )
+    finally:
+        queue.put(None)
+        listener.join()
+
+def init_worker( settings: Dict[str, Any], queue: Any ) -> None:
+    Trace.set( **settings )
+    Trace.redirect( queue.put )
+
+def print_trace( queue: Any ) -> None:
+
+    # must keep draining the queue - otherwise the workers block at exit
+
+    while (text := queue.get()) is not None:
+        try:
+            Trace.write(text)
+        except (OSError, ValueError):
+            pass
+
+def scan_project( project: Path, ignore_list: Dict[str, List[str]], write: bool, force: bool, threads: int ) -> bool:
+    if write:
+        return write_metadata(DRIVE, project, verbose=True)
+    else:
+        return read_metadata(DRIVE, project, ignore_list, reset=force, max_workers=threads)
 
 if __name__ == "__main__":
     Trace.set( debug_mode=True, timezone=False )
@@ -47,7 +104,7 @@ if __name__ == "__main__":
     Prefs.load("ignore.yaml")
 
     try:
-        main( args["write"] )
+        main( args["write"], args["force"] )
     except KeyboardInterrupt:
         Trace.exception("KeyboardInterrupt")
         sys.exit()
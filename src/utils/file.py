@@ -67,6 +67,14 @@ from pathlib import Path
 
 from utils.trace import Trace
 
+# optional: pip install orjson (C encoder/decoder), otherwise json from stdlib
+
+try:
+    import orjson # type: ignore[import-not-found, unused-ignore]
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # timestamp
 
 def get_modification_timestamp(filename: Path | str) -> float:
@@ -296,6 +304,12 @@ def import_text( folderpath: Path | str, filename: Path | str, encoding: str="ut
 def import_json( folderpath: Path | str, filename: str, show_error: bool=True ) -> Any | None:
     result = import_text(folderpath, filename, show_error=show_error)
     if result:
+        if HAS_ORJSON:
+            try:
+                return orjson.loads(result)
+            except orjson.JSONDecodeError: # e.g. int > 64 bit => json
+                pass
+
         data = json.loads(result)
         return data
     else:
@@ -350,7 +364,15 @@ def export_text(folderpath: Path | str, filename: str, text: str, encoding: str=
         return None
 
 def export_json(folderpath: Path | str, filename: str, data: Dict[str, Any] | List[Any], newline: str="\n", timestamp: float=0.0, show_message: bool=True) -> str | None:
-    text = json.dumps(data, ensure_ascii=False, indent=2)
+    text = None
+    if HAS_ORJSON:
+        try:
+            text = orjson.dumps(data, option=orjson.OPT_INDENT_2).decode("utf-8") # indent as json.dumps(indent=2), floats may be formatted differently
+        except TypeError: # orjson.JSONEncodeError: e.g. int > 64 bit, non-str keys => json
+            pass
+
+    if text is None:
+        text = json.dumps(data, ensure_ascii=False, indent=2)
 
     return export_text(folderpath, filename, text, encoding="utf-8", newline=newline, timestamp=timestamp, show_message=show_message)
 
@@ -523,7 +545,7 @@ def get_file_infos(path: Path | str, filename: str, _in_type: str) -> None | Dic
 
     if os.path.isfile(filepath):
         with open(filepath, "rb") as file:
-            md5 = hashlib.md5(file.read()).hexdigest()
+            md5 = hashlib.md5(file.read(), usedforsecurity=False).hexdigest()
 
         size           = os.path.getsize(filepath)
         timestamp      = get_modification_timestamp(filepath)
@@ -16,6 +16,7 @@
       - Trace.file_save("./logs", "testTrace")
       #
       - Trace.redirect(function) # -> e.g. qDebug (PySide6)
+      - Trace.write(text)          # -> stdout (e.g. redirected messages from other processes)
       #
       - Trace.action()
       - Trace.result()
@@ -181,6 +182,26 @@ class Trace:
     def redirect(cls, output: Callable[..., None]) -> None:
         cls.output = output
 
+    @classmethod
+    def write(cls, text: str) -> None:
+
+        # https://docs.python.org/3/library/io.html#io.IOBase.isatty
+
+        def is_redirected(stream: Any) -> bool:
+            return not hasattr(stream, "isatty") or not stream.isatty()
+
+        if not cls.settings["color"] or is_redirected(sys.stdout):
+            text = Color.clear(text)
+
+        # https://docs.python.org/3/library/sys.html#sys.displayhook
+
+        bytes = (text + "\n").encode("utf-8", "backslashreplace")
+        if hasattr(sys.stdout, "buffer"):
+            sys.stdout.buffer.write(bytes)
+            sys.stdout.flush()
+        else:
+            sys.stdout.write(bytes.decode("utf-8", "strict"))
+
     @classmethod
     def file_init(cls, pattern_list: None | List[str] = None, csv: bool = False) -> None:
         if pattern_list is None:
@@ -446,20 +467,4 @@ class Trace:
             else:
                 cls.messages.append(Color.clear(text_no_tabs))
 
-        # https://docs.python.org/3/library/io.html#io.IOBase.isatty
-
-        def is_redirected(stream: Any) -> bool:
-            return not hasattr(stream, "isatty") or not stream.isatty()
-
-        if not cls.settings["color"] or is_redirected(sys.stdout):
-            text_no_tabs = Color.clear(text_no_tabs)
-
-        # https://docs.python.org/3/library/sys.html#sys.displayhook
-
-        bytes = (text_no_tabs + "\n").encode("utf-8", "backslashreplace")
-        if hasattr(sys.stdout, "buffer"):
-            sys.stdout.buffer.write(bytes)
-            sys.stdout.flush()
-        else:
-            text = bytes.decode("utf-8", "strict")
-            sys.stdout.write(text)
+        cls.write(text_no_tabs)